@@ -7,32 +7,20 @@ questions about the database through natural conversation.
 """
 
 import asyncio
+import logging
 import os
-from typing import Optional
+import sys
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
-
-# Try to load .env file if available
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ImportError:
-    # dotenv not available, continue without it
-    pass
-import logging
-
 from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.prompt import Prompt
 
-from .agent import DatabaseAgent
-from .llm import OpenRouterLLM
-from .mcp_client import MCPClient
+# The LLM and MCP clients pull in openai and mcp, which dominate startup time,
+# so they are imported where used and --help or argument errors stay fast
+if TYPE_CHECKING:
+    from .llm import OpenRouterLLM
+    from .mcp_client import MCPClient
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 console = Console()
@@ -40,15 +28,24 @@ app = typer.Typer()
 
 
 async def run_chat_loop(
-    llm: OpenRouterLLM,
-    mcp_client: MCPClient,
+    llm: "OpenRouterLLM",
+    mcp_client: "MCPClient",
     initial_message: Optional[str] = None,
     debug: bool = False,
     timeout: float = 60.0,
 ):
     """Run the interactive chat loop."""
-    # Create the database agent
-    chat_client = DatabaseAgent(llm, mcp_client, console)
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+
+    from .agent import DatabaseAgent
+
+    # Create the database agent; a stalled LLM call gets a third of the
+    # request timeout, leaving room for a retry
+    chat_client = DatabaseAgent(
+        llm, mcp_client, console, per_call_timeout=timeout / 3
+    )
 
     console.print(
         Panel(
@@ -71,8 +68,10 @@ async def run_chat_loop(
             )
 
             if result:
-                console.print("\n[blue]Assistant:[/blue]")
-                console.print(Markdown(result))
+                # A streamed answer is already on screen
+                if not chat_client.last_response_streamed:
+                    console.print("\n[blue]Assistant:[/blue]")
+                    console.print(Markdown(result))
             else:
                 console.print(
                     "\n[yellow]The assistant didn't provide a response. The query may have been too complex.[/yellow]"
@@ -93,8 +92,9 @@ async def run_chat_loop(
     # Main chat loop (only runs if no initial message)
     while True:
         try:
-            # Get user input
-            user_input = Prompt.ask("\n[green]You[/green]")
+            # Get user input off the event loop, so history compaction started
+            # by the last answer keeps running while the user types
+            user_input = await asyncio.to_thread(Prompt.ask, "\n[green]You[/green]")
 
             if user_input.lower() == "exit":
                 console.print("[yellow]Goodbye![/yellow]")
@@ -112,8 +112,10 @@ async def run_chat_loop(
                 )
 
                 if result:
-                    console.print("\n[blue]Assistant:[/blue]")
-                    console.print(Markdown(result))
+                    # A streamed answer is already on screen
+                    if not chat_client.last_response_streamed:
+                        console.print("\n[blue]Assistant:[/blue]")
+                        console.print(Markdown(result))
                 else:
                     console.print(
                         "\n[yellow]The assistant didn't provide a response. Try a simpler question.[/yellow]"
@@ -133,6 +135,74 @@ async def run_chat_loop(
             logger.error(f"Chat error: {e}", exc_info=True)
 
 
+async def run_batch(
+    llm: "OpenRouterLLM",
+    mcp_client: "MCPClient",
+    queries: List[str],
+    parallel: int,
+    timeout: float = 60.0,
+):
+    """Answer independent questions concurrently and print them in input order."""
+    from rich.markdown import Markdown
+
+    from .agent import DatabaseAgent
+    from .llm_cache import CompletionCache
+
+    # Each agent handles one question at a time, so the pool also bounds
+    # concurrency; all agents share the LLM, MCP session and response cache
+    completion_cache = CompletionCache()
+    agents: asyncio.Queue = asyncio.Queue()
+    for _ in range(min(parallel, len(queries))):
+        agents.put_nowait(
+            DatabaseAgent(
+                llm,
+                mcp_client,
+                completion_cache=completion_cache,
+                per_call_timeout=timeout / 3,
+            )
+        )
+
+    async def answer(query: str) -> str:
+        agent = await agents.get()
+        try:
+            agent.clear_conversation()
+            return await asyncio.wait_for(agent.process_query(query), timeout=timeout)
+        finally:
+            agents.put_nowait(agent)
+
+    console.print(
+        f"[dim]Answering {len(queries)} questions with up to {agents.qsize()} agents...[/dim]"
+    )
+    results = await asyncio.gather(
+        *(answer(query) for query in queries), return_exceptions=True
+    )
+
+    for query, result in zip(queries, results):
+        console.print(f"\n[green]You:[/green] {query}")
+        if isinstance(result, asyncio.TimeoutError):
+            console.print(
+                f"[red]Request timed out after {int(timeout)} seconds.[/red]"
+            )
+        elif isinstance(result, Exception):
+            console.print(f"[red]Error:[/red] {result}")
+        elif result:
+            console.print("\n[blue]Assistant:[/blue]")
+            console.print(Markdown(result))
+        else:
+            console.print(
+                "\n[yellow]The assistant didn't provide a response.[/yellow]"
+            )
+
+
+def _install_uvloop() -> None:
+    """Switch asyncio to uvloop when it is importable (never on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 @app.command()
 def main(
     model: str = typer.Option(
@@ -161,6 +231,12 @@ def main(
         "-t",
         help="Timeout in seconds for each request (default: 60)",
     ),
+    parallel: int = typer.Option(
+        1,
+        "--parallel",
+        min=1,
+        help="Answer questions piped on stdin (one per line) with up to N agents at once",
+    ),
 ):
     """
     Chat with your Oracle database using natural language.
@@ -181,14 +257,23 @@ def main(
     \b
     # Use a different model
     python -m mcp_chat.chat --model anthropic/claude-3-opus
+
+    \b
+    # Answer a file of questions, four at a time
+    python -m mcp_chat.chat --parallel 4 < questions.txt
     """
 
-    # Setup logging
-    if debug:
-        logging.getLogger().setLevel(logging.DEBUG)
-    else:
-        # Suppress all logging except errors
-        logging.getLogger().setLevel(logging.ERROR)
+    # Try to load .env file if available
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except ImportError:
+        # dotenv not available, continue without it
+        pass
+
+    # Setup logging, suppressing all logging except errors unless debugging
+    logging.basicConfig(level=logging.DEBUG if debug else logging.ERROR)
 
     # Get connection string
     connection_string = connection or os.getenv("DB_CONNECTION_STRING")
@@ -198,6 +283,9 @@ def main(
         )
         raise typer.Exit(1)
 
+    from .llm import OpenRouterLLM
+    from .mcp_client import MCPClient
+
     # Create LLM
     try:
         llm = OpenRouterLLM(api_key=api_key, model=model)
@@ -206,15 +294,30 @@ def main(
         console.print(f"[red]Error:[/red] {e}")
         raise typer.Exit(1)
 
-    # Set connection string in environment for MCP server
-    os.environ["DB_CONNECTION_STRING"] = connection_string
+    # Create MCP client, handing the connection string to the server process
+    mcp_client = MCPClient(
+        debug=debug, env={"DB_CONNECTION_STRING": connection_string}
+    )
 
-    # Create MCP client
-    mcp_client = MCPClient(debug=debug)
+    # With --parallel, questions piped on stdin are answered as a batch
+    queries = []
+    if parallel > 1 and not sys.stdin.isatty():
+        queries = ([message] if message else []) + [
+            line.strip() for line in sys.stdin if line.strip()
+        ]
 
     async def run():
-        async with mcp_client:
-            await run_chat_loop(llm, mcp_client, message, debug, timeout)
+        try:
+            async with mcp_client:
+                if queries:
+                    await run_batch(llm, mcp_client, queries, parallel, timeout)
+                else:
+                    await run_chat_loop(llm, mcp_client, message, debug, timeout)
+        finally:
+            # The LLM client keeps one connection pool for the whole session
+            await llm.aclose()
+
+    _install_uvloop()
 
     # Run the async main
     try:
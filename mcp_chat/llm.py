@@ -3,9 +3,17 @@ Simple OpenRouter LLM client using OpenAI SDK.
 """
 
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, BadRequestError
+
+# Phrases in the 400 response of backends (e.g. vLLM) that accept only one
+# tool call per response
+_SINGLE_TOOL_CALL_MESSAGES = ("model only supports one tool call", "single tool call")
+
+
+class SingleToolCallLimitError(Exception):
+    """The model backend rejected a request because it allows only one tool call."""
 
 
 class OpenRouterLLM:
@@ -32,13 +40,25 @@ class OpenRouterLLM:
             },
         )
 
+    @property
+    def supports_prompt_caching(self) -> bool:
+        """Whether the model needs explicit cache_control breakpoints (Anthropic via OpenRouter)."""
+        return self.model.startswith("anthropic/")
+
     async def create_completion(
         self,
         messages: List[Dict[str, Any]],
         tools: Optional[List[Dict[str, Any]]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
         **kwargs,
     ) -> Dict[str, Any]:
-        """Create a chat completion."""
+        """
+        Create a chat completion.
+
+        When on_token is given the response is streamed and on_token is called
+        with each piece of content as it arrives. The return value has the same
+        shape either way.
+        """
         completion_kwargs = {
             "model": self.model,
             "messages": messages,
@@ -52,5 +72,73 @@ class OpenRouterLLM:
         if "tool_choice" in kwargs:
             completion_kwargs["tool_choice"] = kwargs["tool_choice"]
 
-        response = await self.client.chat.completions.create(**completion_kwargs)
-        return response.model_dump()
+        if on_token is None:
+            response = await self._create(**completion_kwargs)
+            return response.model_dump()
+
+        stream = await self._create(stream=True, **completion_kwargs)
+
+        # Accumulate content and tool call fragments; tool call arguments
+        # arrive in pieces keyed by the call's index
+        content_parts: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        finish_reason = None
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+
+            if delta.content:
+                content_parts.append(delta.content)
+                on_token(delta.content)
+
+            for tool_call_delta in delta.tool_calls or []:
+                tool_call = tool_calls.setdefault(
+                    tool_call_delta.index,
+                    {
+                        "id": None,
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""},
+                    },
+                )
+                if tool_call_delta.id:
+                    tool_call["id"] = tool_call_delta.id
+                if tool_call_delta.function:
+                    if tool_call_delta.function.name:
+                        tool_call["function"]["name"] += tool_call_delta.function.name
+                    if tool_call_delta.function.arguments:
+                        tool_call["function"]["arguments"] += (
+                            tool_call_delta.function.arguments
+                        )
+
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+        message: Dict[str, Any] = {
+            "role": "assistant",
+            "content": "".join(content_parts) or None,
+        }
+        if tool_calls:
+            message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+
+        return {
+            "choices": [
+                {"index": 0, "message": message, "finish_reason": finish_reason}
+            ]
+        }
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections held by the client."""
+        await self.client.close()
+
+    async def _create(self, **completion_kwargs):
+        """Send a chat completion request, translating known backend limits to typed errors."""
+        try:
+            return await self.client.chat.completions.create(**completion_kwargs)
+        except BadRequestError as e:
+            message = str(e).lower()
+            if any(phrase in message for phrase in _SINGLE_TOOL_CALL_MESSAGES):
+                raise SingleToolCallLimitError(str(e)) from e
+            raise
@@ -0,0 +1,85 @@
+"""
+Exact-match response cache for LLM chat completions.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from .llm import OpenRouterLLM
+
+logger = logging.getLogger(__name__)
+
+# Canonical encoding of a request for hashing, shared across all lookups
+_KEY_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+class CompletionCache:
+    """LRU cache of chat completions keyed by model, messages, tools and options."""
+
+    def __init__(self, max_size: int = 128, ttl: float = 600.0):
+        """
+        Initialize the completion cache.
+
+        Args:
+            max_size: Maximum number of completions kept in the LRU cache
+            ttl: Seconds a cached completion stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs,
+    ) -> str:
+        """Hash a completion request into a stable cache key."""
+        payload = _KEY_ENCODER.encode(
+            {"model": model, "messages": messages, "tools": tools, "options": kwargs}
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    async def complete(
+        self,
+        llm: OpenRouterLLM,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Return a cached completion for an identical request, or create one.
+
+        on_token is only used on a miss and is not part of the cache key, so a
+        hit returns without streaming anything.
+        """
+        key = self.make_key(llm.model, messages, tools, **kwargs)
+
+        cached = self._entries.get(key)
+        if cached is not None:
+            stored_at, response = cached
+            if time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                logger.debug("Completion cache hit: %s", key)
+                return response
+            del self._entries[key]
+
+        response = await llm.create_completion(
+            messages=messages, tools=tools, on_token=on_token, **kwargs
+        )
+
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return response
+
+    def clear(self) -> None:
+        """Drop every cached completion."""
+        self._entries.clear()
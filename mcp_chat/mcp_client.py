@@ -9,17 +9,32 @@ This client follows the MCP protocol by:
 4. Executing tools via session.call_tool()
 """
 
+import copy
 import json
 import logging
 import os
+import time
+from collections import OrderedDict
 from contextlib import AsyncExitStack
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from mcp import ClientSession, StdioServerParameters, stdio_client
 from mcp.types import Tool
 
 logger = logging.getLogger(__name__)
 
+# Metadata tools whose results rarely change and can be served from cache
+CACHEABLE_TOOLS = frozenset(
+    {
+        "list_tables",
+        "list_views",
+        "list_procedures",
+        "describe_table",
+        "describe_tables",
+        "generate_sample_queries",
+    }
+)
+
 
 def convert_mcp_to_openai_tool(mcp_tool: Tool) -> Dict[str, Any]:
     """Convert an MCP tool definition to OpenAI function calling format."""
@@ -51,26 +66,42 @@ def convert_mcp_to_openai_tool(mcp_tool: Tool) -> Dict[str, Any]:
 class MCPClient:
     """Client that communicates with MCP servers using the MCP SDK."""
 
-    def __init__(self, server_script_path: str = None, debug: bool = False):
+    def __init__(
+        self,
+        server_script_path: str = None,
+        debug: bool = False,
+        cache_size: int = 512,
+        cache_ttl: float = 300.0,
+        env: Optional[Dict[str, str]] = None,
+    ):
         """
         Initialize MCP client.
 
         Args:
             server_script_path: Path to the MCP server script (defaults to oracle-mcp-server)
             debug: Enable debug logging
+            cache_size: Maximum number of metadata tool results kept in the LRU cache
+            cache_ttl: Seconds a cached metadata result stays valid
+            env: Extra environment variables for the server process only
         """
         self.server_script_path = server_script_path or "oracle-mcp-server"
         self.debug = debug
+        self.env = env or {}
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
         self._tools_cache: Optional[List[Tool]] = None
         self._openai_tools_cache: Optional[List[Dict[str, Any]]] = None
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._result_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
 
     async def start_server(self) -> None:
         """Connect to the MCP server using stdio transport."""
         try:
             # Configure server parameters
-            env = os.environ.copy()
+            env = {**os.environ, **self.env}
             if self.debug:
                 env["DEBUG"] = "true"
 
@@ -108,8 +139,29 @@ class MCPClient:
         self.session = None
         self._tools_cache = None
         self._openai_tools_cache = None
+        self.invalidate_cache()
         logger.info("Disconnected from MCP server")
 
+    def invalidate_cache(self, tool_name: Optional[str] = None) -> None:
+        """
+        Drop cached metadata tool results, e.g. after a schema change.
+
+        Args:
+            tool_name: Only drop results for this tool (defaults to all tools)
+        """
+        if tool_name is None:
+            self._result_cache.clear()
+            return
+        for key in [key for key in self._result_cache if key[0] == tool_name]:
+            del self._result_cache[key]
+
+    def _remember(self, key: Tuple[str, str], value: Dict[str, Any]) -> None:
+        """Store a tool result, evicting the least recently used entry if full."""
+        self._result_cache[key] = (time.monotonic(), value)
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > self.cache_size:
+            self._result_cache.popitem(last=False)
+
     async def get_available_tools(self) -> List[Tool]:
         """Get list of available tools from the MCP server."""
         if not self.session:
@@ -147,13 +199,28 @@ class MCPClient:
         if not self.session:
             raise RuntimeError("Not connected to MCP server")
 
+        # Serve repeated metadata lookups from the cache
+        cache_key = None
+        if tool_name in CACHEABLE_TOOLS:
+            cache_key = (tool_name, json.dumps(arguments, sort_keys=True))
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                stored_at, value = cached
+                if time.monotonic() - stored_at < self.cache_ttl:
+                    self._result_cache.move_to_end(cache_key)
+                    # Callers may modify the result, so never hand out the
+                    # cached object itself
+                    return copy.deepcopy(value)
+                del self._result_cache[cache_key]
+
         try:
             # Call tool through the session
             result = await self.session.call_tool(tool_name, arguments)
 
-            # Debug: log the result type and content
-            logger.debug(f"Tool result type: {type(result)}")
-            logger.debug(f"Tool result: {result}")
+            # Debug: log the result type and content. Use lazy %-formatting so
+            # large results are not rendered to a string unless DEBUG is on
+            logger.debug("Tool result type: %s", type(result))
+            logger.debug("Tool result: %s", result)
 
             # The result is a CallToolResult with a 'content' attribute containing a list of TextContent
             if hasattr(result, "content") and isinstance(result.content, list):
@@ -163,10 +230,16 @@ class MCPClient:
                     if hasattr(text_content, "text"):
                         # Parse JSON response if possible
                         try:
-                            return json.loads(text_content.text)
+                            parsed = json.loads(text_content.text)
                         except json.JSONDecodeError:
                             # If not JSON, return as-is in a dict
                             return {"result": text_content.text}
+
+                        # Only successful (JSON) results are cached; errors
+                        # come back as plain text
+                        if cache_key is not None:
+                            self._remember(cache_key, copy.deepcopy(parsed))
+                        return parsed
                     else:
                         return {"error": "Unexpected content format"}
                 else:
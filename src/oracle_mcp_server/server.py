@@ -16,13 +16,19 @@ Features:
 
 import argparse
 import asyncio
+import csv
+import io
+import itertools
 import json
 import logging
 import os
+import re
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 import oracledb
 from mcp import stdio_server
@@ -61,13 +67,96 @@ if DEBUG:
     logging.getLogger().setLevel(logging.DEBUG)
     logger.setLevel(logging.DEBUG)
 
+# Statement prefixes that are always allowed, and keywords rejected in any
+# other statement. Matched once per query, so keep them precompiled.
+_ALLOWED_STATEMENT_PREFIXES = ("SELECT", "WITH", "DESCRIBE", "DESC", "EXPLAIN")
+_DANGEROUS_KEYWORDS = re.compile("DROP|DELETE|TRUNCATE|ALTER|CREATE|INSERT|UPDATE")
+
+# Oracle rejects IN lists with more than 1000 expressions
+_IN_LIST_CHUNK_SIZE = 1000
+
+# Column-specific sample query templates, keyed by Oracle data type
+_DISTINCT_VALUES_TEMPLATE = (
+    "-- Find distinct values for {col}\n"
+    "SELECT DISTINCT {col} FROM {table} WHERE {col} IS NOT NULL AND ROWNUM <= 20;"
+)
+_STATISTICS_TEMPLATE = (
+    "-- Statistics for {col}\nSELECT MIN({col}), MAX({col}), AVG({col}) FROM {table};"
+)
+_DATE_RANGE_TEMPLATE = "-- Date range for {col}\nSELECT MIN({col}), MAX({col}) FROM {table};"
+_SAMPLE_QUERY_TEMPLATES = {
+    "VARCHAR2": _DISTINCT_VALUES_TEMPLATE,
+    "CHAR": _DISTINCT_VALUES_TEMPLATE,
+    "CLOB": _DISTINCT_VALUES_TEMPLATE,
+    "NUMBER": _STATISTICS_TEMPLATE,
+    "INTEGER": _STATISTICS_TEMPLATE,
+    "DATE": _DATE_RANGE_TEMPLATE,
+    "TIMESTAMP": _DATE_RANGE_TEMPLATE,
+}
+
+
+def _to_serializable(value: Any) -> Any:
+    """Convert an Oracle value to a JSON-serializable equivalent"""
+    if hasattr(value, "read"):  # LOB object
+        return str(value.read())
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _fetch_serializable(cursor) -> List[List[Any]]:
+    """Fetch all remaining rows from a cursor as JSON-serializable lists"""
+    return [[_to_serializable(value) for value in row] for row in cursor.fetchall()]
+
+
+def _rows_to_csv(columns: List[str], rows: List[List[Any]]) -> str:
+    """Render a header and result rows as CSV text (None becomes an empty field)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows(rows)
+    return buffer.getvalue().removesuffix("\n")
+
+
+def _json_content(result: Any) -> list[TextContent]:
+    """Wrap a JSON-serializable result as MCP text content"""
+    return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+
 
 class OracleConnection:
     """Manages Oracle database connections with connection pooling"""
 
+    POOL_MAX_SIZE = 10
+
     def __init__(self, connection_string: str):
         self.connection_string = connection_string
         self.pool: Optional[oracledb.ConnectionPool] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # pool.acquire() blocks while every connection is checked out, so it
+        # waits on its own threads; sharing the I/O pool would let waiting
+        # acquires occupy every worker and starve the calls holding connections
+        self._acquire_executor: Optional[ThreadPoolExecutor] = None
+        # Serializes pool creation so concurrent first callers share one pool
+        self._pool_lock = asyncio.Lock()
+
+    async def run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking driver call on the dedicated Oracle I/O thread pool"""
+        if self._executor is None:
+            # Sized to the connection pool, so every pooled connection can be busy at once
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.POOL_MAX_SIZE, thread_name_prefix="oracle-io"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _acquire(self) -> oracledb.Connection:
+        """Wait for a pooled connection on the acquire thread pool"""
+        if self._acquire_executor is None:
+            self._acquire_executor = ThreadPoolExecutor(
+                max_workers=self.POOL_MAX_SIZE, thread_name_prefix="oracle-acquire"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._acquire_executor, self.pool.acquire)
 
     async def initialize_pool(self):
         """Initialize connection pool"""
@@ -94,7 +183,7 @@ class OracleConnection:
             pool_params = {
                 "dsn": dsn,
                 "min": 1,
-                "max": 10,
+                "max": self.POOL_MAX_SIZE,
                 "increment": 1,
                 "getmode": oracledb.POOL_GETMODE_WAIT,
             }
@@ -104,7 +193,9 @@ class OracleConnection:
             if password:
                 pool_params["password"] = password
 
-            self.pool = oracledb.create_pool(**pool_params)
+            self.pool = await self.run_blocking(
+                partial(oracledb.create_pool, **pool_params)
+            )
             logger.info("Oracle connection pool initialized successfully")
 
         except Exception as e:
@@ -114,14 +205,22 @@ class OracleConnection:
     async def get_connection(self) -> oracledb.Connection:
         """Get a connection from the pool"""
         if not self.pool:
-            await self.initialize_pool()
-        return self.pool.acquire()
+            async with self._pool_lock:
+                # Another caller may have created the pool while this one waited
+                if not self.pool:
+                    await self.initialize_pool()
+        return await self._acquire()
 
     def close_pool(self):
         """Close the connection pool"""
         if self.pool:
             self.pool.close()
             logger.info("Oracle connection pool closed")
+        for executor in (self._executor, self._acquire_executor):
+            if executor:
+                executor.shutdown(wait=False)
+        self._executor = None
+        self._acquire_executor = None
 
 
 class DatabaseInspector:
@@ -130,8 +229,10 @@ class DatabaseInspector:
     def __init__(self, connection_manager: OracleConnection):
         self.connection_manager = connection_manager
 
-    async def get_tables(self, owner: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get list of tables with metadata"""
+    async def get_tables(
+        self, owner: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get list of tables with metadata, optionally capped at `limit` rows"""
         conn = await self.connection_manager.get_connection()
         try:
             cursor = conn.cursor()
@@ -195,10 +296,16 @@ class DatabaseInspector:
             else:
                 query += " ORDER BY t.table_name"
 
-            cursor.execute(query, params)
+            # Push the row limit into the query so unused rows are never fetched
+            if limit:
+                query = f"SELECT * FROM ({query}) WHERE ROWNUM <= :row_limit"
+                params.append(limit)
+
+            await self.connection_manager.run_blocking(cursor.execute, query, params)
+            rows = await self.connection_manager.run_blocking(list, cursor)
 
             tables = []
-            for row in cursor:
+            for row in rows:
                 tables.append(
                     {
                         "owner": row[0],
@@ -249,35 +356,104 @@ class DatabaseInspector:
 
             query += " ORDER BY c.column_id"
 
-            cursor.execute(query, params)
+            await self.connection_manager.run_blocking(cursor.execute, query, params)
+            rows = await self.connection_manager.run_blocking(list, cursor)
 
             columns = []
-            for row in cursor:
+            for row in rows:
                 # Apply column whitelist if configured
                 full_column_name = f"{table_name}.{row[0]}"
                 if COLUMN_WHITE_LIST and COLUMN_WHITE_LIST != [""]:
                     if full_column_name not in COLUMN_WHITE_LIST:
                         continue
 
-                columns.append(
-                    {
-                        "column_name": row[0],
-                        "data_type": row[1],
-                        "data_length": row[2],
-                        "data_precision": row[3],
-                        "data_scale": row[4],
-                        "nullable": row[5],
-                        "data_default": row[6],
-                        "column_comment": row[7],
-                        "column_id": row[8],
-                    }
-                )
+                columns.append(self._column_from_row(row))
 
             return columns
 
         finally:
             conn.close()
 
+    async def get_tables_columns(
+        self, table_names: List[str], owner: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get column information for several tables with one query per 1000 tables"""
+        table_columns: Dict[str, List[Dict[str, Any]]] = {
+            name: [] for name in table_names
+        }
+        if not table_columns:
+            return table_columns
+
+        conn = await self.connection_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+            names = list(table_columns)
+
+            for start in range(0, len(names), _IN_LIST_CHUNK_SIZE):
+                chunk = names[start : start + _IN_LIST_CHUNK_SIZE]
+                placeholders = ",".join(f":table_{i}" for i in range(len(chunk)))
+
+                query = f"""
+                    SELECT 
+                        c.column_name,
+                        c.data_type,
+                        c.data_length,
+                        c.data_precision,
+                        c.data_scale,
+                        c.nullable,
+                        c.data_default,
+                        cc.comments as column_comment,
+                        c.column_id,
+                        c.table_name
+                    FROM all_tab_columns c
+                    LEFT JOIN all_col_comments cc ON c.owner = cc.owner 
+                        AND c.table_name = cc.table_name 
+                        AND c.column_name = cc.column_name
+                    WHERE c.table_name IN ({placeholders})
+                """
+
+                params = list(chunk)
+
+                if owner:
+                    query += " AND c.owner = :owner"
+                    params.append(owner)
+
+                query += " ORDER BY c.table_name, c.column_id"
+
+                await self.connection_manager.run_blocking(
+                    cursor.execute, query, params
+                )
+                rows = await self.connection_manager.run_blocking(list, cursor)
+
+                for row in rows:
+                    # Apply column whitelist if configured
+                    full_column_name = f"{row[9]}.{row[0]}"
+                    if COLUMN_WHITE_LIST and COLUMN_WHITE_LIST != [""]:
+                        if full_column_name not in COLUMN_WHITE_LIST:
+                            continue
+
+                    table_columns[row[9]].append(self._column_from_row(row))
+
+            return table_columns
+
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _column_from_row(row) -> Dict[str, Any]:
+        """Build a column description from an ALL_TAB_COLUMNS row"""
+        return {
+            "column_name": row[0],
+            "data_type": row[1],
+            "data_length": row[2],
+            "data_precision": row[3],
+            "data_scale": row[4],
+            "nullable": row[5],
+            "data_default": row[6],
+            "column_comment": row[7],
+            "column_id": row[8],
+        }
+
     async def get_views(self, owner: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get list of views"""
         conn = await self.connection_manager.get_connection()
@@ -302,10 +478,11 @@ class DatabaseInspector:
 
             query += " ORDER BY v.owner, v.view_name"
 
-            cursor.execute(query, params)
+            await self.connection_manager.run_blocking(cursor.execute, query, params)
+            rows = await self.connection_manager.run_blocking(list, cursor)
 
             views = []
-            for row in cursor:
+            for row in rows:
                 views.append(
                     {"owner": row[0], "view_name": row[1], "view_comment": row[2]}
                 )
@@ -341,10 +518,11 @@ class DatabaseInspector:
 
             query += " ORDER BY owner, object_type, object_name"
 
-            cursor.execute(query, params)
+            await self.connection_manager.run_blocking(cursor.execute, query, params)
+            rows = await self.connection_manager.run_blocking(list, cursor)
 
             procedures = []
-            for row in cursor:
+            for row in rows:
                 procedures.append(
                     {
                         "owner": row[0],
@@ -376,23 +554,10 @@ class QueryExecutor:
         # Basic SQL injection prevention
         sql_upper = sql.upper().strip()
 
-        # Check for potentially dangerous operations
-        dangerous_keywords = [
-            "DROP",
-            "DELETE",
-            "TRUNCATE",
-            "ALTER",
-            "CREATE",
-            "INSERT",
-            "UPDATE",
-        ]
-
-        # Allow SELECT, DESCRIBE, EXPLAIN PLAN
-        if not any(
-            sql_upper.startswith(keyword)
-            for keyword in ["SELECT", "WITH", "DESCRIBE", "DESC", "EXPLAIN"]
-        ):
-            if any(keyword in sql_upper for keyword in dangerous_keywords):
+        # Allow SELECT, DESCRIBE, EXPLAIN PLAN; otherwise check for
+        # potentially dangerous operations
+        if not sql_upper.startswith(_ALLOWED_STATEMENT_PREFIXES):
+            if _DANGEROUS_KEYWORDS.search(sql_upper):
                 raise ValueError(
                     "Only SELECT, DESCRIBE, and EXPLAIN PLAN statements are allowed"
                 )
@@ -421,34 +586,26 @@ class QueryExecutor:
             start_time = datetime.now()
 
             if params:
-                cursor.execute(sql, params)
+                await self.connection_manager.run_blocking(cursor.execute, sql, params)
             else:
-                cursor.execute(sql)
+                await self.connection_manager.run_blocking(cursor.execute, sql)
 
             execution_time = (datetime.now() - start_time).total_seconds()
 
             # Fetch results
             if cursor.description:
                 columns = [desc[0] for desc in cursor.description]
-                rows = cursor.fetchall()
 
-                # Convert Oracle types to JSON-serializable types
-                serializable_rows = []
-                for row in rows:
-                    serializable_row = []
-                    for value in row:
-                        if hasattr(value, "read"):  # LOB object
-                            serializable_row.append(str(value.read()))
-                        elif isinstance(value, datetime):
-                            serializable_row.append(value.isoformat())
-                        else:
-                            serializable_row.append(value)
-                    serializable_rows.append(serializable_row)
+                # Convert Oracle types to JSON-serializable types off the event
+                # loop, since reading LOB values is another round-trip
+                serializable_rows = await self.connection_manager.run_blocking(
+                    _fetch_serializable, cursor
+                )
 
                 return {
                     "columns": columns,
                     "rows": serializable_rows,
-                    "row_count": len(rows),
+                    "row_count": len(serializable_rows),
                     "execution_time_seconds": execution_time,
                     "query": sql,
                 }
@@ -473,7 +630,7 @@ class QueryExecutor:
 
             # Explain the plan
             explain_sql = f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}"
-            cursor.execute(explain_sql)
+            await self.connection_manager.run_blocking(cursor.execute, explain_sql)
 
             # Fetch the execution plan
             plan_query = """
@@ -490,10 +647,13 @@ class QueryExecutor:
                 ORDER BY id
             """
 
-            cursor.execute(plan_query, [statement_id, statement_id])
+            await self.connection_manager.run_blocking(
+                cursor.execute, plan_query, [statement_id, statement_id]
+            )
+            rows = await self.connection_manager.run_blocking(list, cursor)
 
             plan_rows = []
-            for row in cursor:
+            for row in rows:
                 plan_rows.append(
                     {
                         "operation": row[0],
@@ -505,11 +665,12 @@ class QueryExecutor:
                 )
 
             # Clean up
-            cursor.execute(
+            await self.connection_manager.run_blocking(
+                cursor.execute,
                 "DELETE FROM plan_table WHERE statement_id = :statement_id",
                 [statement_id],
             )
-            conn.commit()
+            await self.connection_manager.run_blocking(conn.commit)
 
             return {"execution_plan": plan_rows, "statement_id": statement_id}
 
@@ -520,12 +681,27 @@ class QueryExecutor:
 class OracleMCPServer:
     """Main MCP Server class for Oracle Database integration"""
 
-    def __init__(self):
+    def __init__(self, connection_string: Optional[str] = None):
         self.server = Server("oracle-database")
-        self.connection_manager = OracleConnection(DB_CONNECTION_STRING)
+        self.connection_manager = OracleConnection(
+            connection_string or DB_CONNECTION_STRING
+        )
         self.inspector = DatabaseInspector(self.connection_manager)
         self.executor = QueryExecutor(self.connection_manager)
 
+        # Tool name -> handler, so call_tool dispatch is a single dict lookup
+        self._tool_handlers = {
+            "execute_query": self._handle_execute_query,
+            "describe_table": self._handle_describe_table,
+            "describe_tables": self._handle_describe_tables,
+            "list_tables": self._handle_list_tables,
+            "list_views": self._handle_list_views,
+            "list_procedures": self._handle_list_procedures,
+            "explain_query": self._handle_explain_query,
+            "generate_sample_queries": self._handle_generate_sample_queries,
+            "export_query_results": self._handle_export_query_results,
+        }
+
     async def setup_handlers(self):
         """Setup MCP server handlers"""
 
@@ -536,7 +712,7 @@ class OracleMCPServer:
 
             try:
                 # Get database schema information
-                tables = await self.inspector.get_tables()
+                tables = await self.inspector.get_tables(limit=50)
 
                 # Add schema overview resource
                 resources.append(
@@ -549,7 +725,7 @@ class OracleMCPServer:
                 )
 
                 # Add individual table resources
-                for table in tables[:50]:  # Limit to first 50 tables
+                for table in tables:
                     table_uri = f"oracle://table/{table['owner']}.{table['table_name']}"
                     resources.append(
                         Resource(
@@ -573,10 +749,13 @@ class OracleMCPServer:
 
             try:
                 if uri_str == "oracle://schema/overview":
-                    # Return complete schema overview
-                    tables = await self.inspector.get_tables()
-                    views = await self.inspector.get_views()
-                    procedures = await self.inspector.get_procedures()
+                    # Return complete schema overview; the three catalog
+                    # lookups are independent, so fetch them concurrently
+                    tables, views, procedures = await asyncio.gather(
+                        self.inspector.get_tables(),
+                        self.inspector.get_views(),
+                        self.inspector.get_procedures(),
+                    )
 
                     overview = {
                         "database_type": "Oracle",
@@ -664,6 +843,26 @@ class OracleMCPServer:
                         "required": ["table_name"],
                     },
                 ),
+                Tool(
+                    name="describe_tables",
+                    description="Get column information for several tables in one call",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "table_names": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Names of the tables to describe",
+                            },
+                            "owner": {
+                                "type": "string",
+                                "description": "Schema owner (optional)",
+                                "default": None,
+                            },
+                        },
+                        "required": ["table_names"],
+                    },
+                ),
                 Tool(
                     name="list_tables",
                     description="List all tables in the database with metadata",
@@ -674,7 +873,12 @@ class OracleMCPServer:
                                 "type": "string",
                                 "description": "Filter by schema owner (optional)",
                                 "default": None,
-                            }
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of tables to return (optional)",
+                                "default": None,
+                            },
                         },
                     },
                 ),
@@ -766,177 +970,145 @@ class OracleMCPServer:
             """Handle tool calls"""
 
             try:
-                if name == "execute_query":
-                    sql = arguments.get("sql")
-                    params = arguments.get("params", [])
+                handler = self._tool_handlers.get(name)
+                if handler is None:
+                    raise ValueError(f"Unknown tool: {name}")
 
-                    result = await self.executor.execute_query(sql, params)
+                return await handler(arguments)
 
-                    return [
-                        TextContent(
-                            type="text", text=json.dumps(result, indent=2, default=str)
-                        )
-                    ]
+            except Exception as e:
+                logger.error(f"Error calling tool {name}: {e}")
+                logger.error(traceback.format_exc())
 
-                elif name == "describe_table":
-                    table_name = arguments.get("table_name")
-                    owner = arguments.get("owner")
+                return [TextContent(type="text", text=f"Error: {str(e)}")]
 
-                    columns = await self.inspector.get_table_columns(table_name, owner)
+    async def _handle_execute_query(self, arguments: dict) -> list[TextContent]:
+        """Execute a SQL query"""
+        sql = arguments.get("sql")
+        params = arguments.get("params", [])
 
-                    result = {
-                        "table_name": table_name,
-                        "owner": owner,
-                        "columns": columns,
-                        "column_count": len(columns),
-                    }
+        result = await self.executor.execute_query(sql, params)
 
-                    return [
-                        TextContent(
-                            type="text", text=json.dumps(result, indent=2, default=str)
-                        )
-                    ]
+        return _json_content(result)
 
-                elif name == "list_tables":
-                    owner = arguments.get("owner")
-                    tables = await self.inspector.get_tables(owner)
+    async def _handle_describe_table(self, arguments: dict) -> list[TextContent]:
+        """Describe the columns of a table"""
+        table_name = arguments.get("table_name")
+        owner = arguments.get("owner")
 
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps({"tables": tables}, indent=2, default=str),
-                        )
-                    ]
+        columns = await self.inspector.get_table_columns(table_name, owner)
 
-                elif name == "list_views":
-                    owner = arguments.get("owner")
-                    views = await self.inspector.get_views(owner)
+        result = {
+            "table_name": table_name,
+            "owner": owner,
+            "columns": columns,
+            "column_count": len(columns),
+        }
 
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps({"views": views}, indent=2, default=str),
-                        )
-                    ]
-
-                elif name == "list_procedures":
-                    owner = arguments.get("owner")
-                    procedures = await self.inspector.get_procedures(owner)
-
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {"procedures": procedures}, indent=2, default=str
-                            ),
-                        )
-                    ]
+        return _json_content(result)
 
-                elif name == "explain_query":
-                    sql = arguments.get("sql")
-                    result = await self.executor.explain_query(sql)
+    async def _handle_describe_tables(self, arguments: dict) -> list[TextContent]:
+        """Describe the columns of several tables with a batched lookup"""
+        table_names = arguments.get("table_names") or []
+        owner = arguments.get("owner")
 
-                    return [
-                        TextContent(
-                            type="text", text=json.dumps(result, indent=2, default=str)
-                        )
-                    ]
+        table_columns = await self.inspector.get_tables_columns(table_names, owner)
 
-                elif name == "generate_sample_queries":
-                    table_name = arguments.get("table_name")
-                    owner = arguments.get("owner")
+        result = {
+            "owner": owner,
+            "tables": [
+                {
+                    "table_name": table_name,
+                    "columns": columns,
+                    "column_count": len(columns),
+                }
+                for table_name, columns in table_columns.items()
+            ],
+            "table_count": len(table_columns),
+        }
 
-                    columns = await self.inspector.get_table_columns(table_name, owner)
+        return _json_content(result)
 
-                    # Generate sample queries
-                    table_ref = f"{owner}.{table_name}" if owner else table_name
-
-                    queries = [
-                        f"-- Basic select all\nSELECT * FROM {table_ref} WHERE ROWNUM <= 10;",
-                        f"-- Count total rows\nSELECT COUNT(*) FROM {table_ref};",
-                    ]
-
-                    # Add column-specific queries
-                    for col in columns[:5]:  # Limit to first 5 columns
-                        col_name = col["column_name"]
-
-                        if col["data_type"] in ["VARCHAR2", "CHAR", "CLOB"]:
-                            queries.append(
-                                f"-- Find distinct values for {col_name}\nSELECT DISTINCT {col_name} FROM {table_ref} WHERE {col_name} IS NOT NULL AND ROWNUM <= 20;"
-                            )
-                        elif col["data_type"] in ["NUMBER", "INTEGER"]:
-                            queries.append(
-                                f"-- Statistics for {col_name}\nSELECT MIN({col_name}), MAX({col_name}), AVG({col_name}) FROM {table_ref};"
-                            )
-                        elif col["data_type"] in ["DATE", "TIMESTAMP"]:
-                            queries.append(
-                                f"-- Date range for {col_name}\nSELECT MIN({col_name}), MAX({col_name}) FROM {table_ref};"
-                            )
-
-                    result = {"table_name": table_name, "sample_queries": queries}
-
-                    return [
-                        TextContent(
-                            type="text", text=json.dumps(result, indent=2, default=str)
-                        )
-                    ]
-
-                elif name == "export_query_results":
-                    sql = arguments.get("sql")
-                    format_type = arguments.get("format", "json")
-
-                    result = await self.executor.execute_query(sql)
-
-                    if format_type == "csv":
-                        # Convert to CSV format
-                        csv_lines = []
-                        csv_lines.append(",".join(result["columns"]))
-
-                        for row in result["rows"]:
-                            csv_row = []
-                            for value in row:
-                                if value is None:
-                                    csv_row.append("")
-                                else:
-                                    # Escape commas and quotes
-                                    str_value = str(value)
-                                    if "," in str_value or '"' in str_value:
-                                        str_value = (
-                                            '"' + str_value.replace('"', '""') + '"'
-                                        )
-                                    csv_row.append(str_value)
-                            csv_lines.append(",".join(csv_row))
-
-                        csv_content = "\n".join(csv_lines)
-
-                        return [
-                            TextContent(
-                                type="text",
-                                text=f"CSV Export ({result['row_count']} rows):\n\n{csv_content}",
-                            )
-                        ]
-                    else:
-                        return [
-                            TextContent(
-                                type="text",
-                                text=json.dumps(result, indent=2, default=str),
-                            )
-                        ]
+    async def _handle_list_tables(self, arguments: dict) -> list[TextContent]:
+        """List tables, optionally filtered by owner and capped by limit"""
+        owner = arguments.get("owner")
+        limit = arguments.get("limit")
+        tables = await self.inspector.get_tables(owner, limit)
 
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
+        return _json_content({"tables": tables})
 
-            except Exception as e:
-                logger.error(f"Error calling tool {name}: {e}")
-                logger.error(traceback.format_exc())
+    async def _handle_list_views(self, arguments: dict) -> list[TextContent]:
+        """List views, optionally filtered by owner"""
+        owner = arguments.get("owner")
+        views = await self.inspector.get_views(owner)
 
-                return [TextContent(type="text", text=f"Error: {str(e)}")]
+        return _json_content({"views": views})
+
+    async def _handle_list_procedures(self, arguments: dict) -> list[TextContent]:
+        """List procedures, functions, and packages, optionally filtered by owner"""
+        owner = arguments.get("owner")
+        procedures = await self.inspector.get_procedures(owner)
+
+        return _json_content({"procedures": procedures})
+
+    async def _handle_explain_query(self, arguments: dict) -> list[TextContent]:
+        """Get the execution plan for a query"""
+        sql = arguments.get("sql")
+        result = await self.executor.explain_query(sql)
+
+        return _json_content(result)
+
+    async def _handle_generate_sample_queries(
+        self, arguments: dict
+    ) -> list[TextContent]:
+        """Generate sample SQL queries for a table"""
+        table_name = arguments.get("table_name")
+        owner = arguments.get("owner")
+
+        columns = await self.inspector.get_table_columns(table_name, owner)
+
+        # Generate sample queries
+        table_ref = f"{owner}.{table_name}" if owner else table_name
+
+        queries = [
+            f"-- Basic select all\nSELECT * FROM {table_ref} WHERE ROWNUM <= 10;",
+            f"-- Count total rows\nSELECT COUNT(*) FROM {table_ref};",
+        ]
+
+        # Add column-specific queries for the first 5 columns
+        for col in itertools.islice(columns, 5):
+            template = _SAMPLE_QUERY_TEMPLATES.get(col["data_type"])
+            if template:
+                queries.append(template.format(col=col["column_name"], table=table_ref))
+
+        result = {"table_name": table_name, "sample_queries": queries}
+
+        return _json_content(result)
+
+    async def _handle_export_query_results(self, arguments: dict) -> list[TextContent]:
+        """Execute a query and export the results as JSON or CSV"""
+        sql = arguments.get("sql")
+        format_type = arguments.get("format", "json")
+
+        result = await self.executor.execute_query(sql)
+
+        if format_type == "csv":
+            csv_content = _rows_to_csv(result["columns"], result["rows"])
+
+            return [
+                TextContent(
+                    type="text",
+                    text=f"CSV Export ({result['row_count']} rows):\n\n{csv_content}",
+                )
+            ]
+
+        return _json_content(result)
 
     async def run(self):
         """Run the MCP server"""
 
         # Validate configuration
-        if not DB_CONNECTION_STRING:
+        if not self.connection_manager.connection_string:
             logger.error("DB_CONNECTION_STRING environment variable is required")
             sys.exit(1)
 
@@ -975,6 +1147,15 @@ async def async_main():
         logger.info("Oracle MCP Server shutdown complete")
 
 
+def _install_uvloop() -> None:
+    """Use uvloop's event loop when it is installed (it is unavailable on Windows)"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 def main():
     """Synchronous entry point for console scripts"""
 
@@ -987,7 +1168,8 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
         logger.setLevel(logging.DEBUG)
 
-    # Run the async main function
+    # Run the async main function, on uvloop when available
+    _install_uvloop()
     asyncio.run(async_main())
 
 
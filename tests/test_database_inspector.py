@@ -55,6 +55,23 @@ class TestDatabaseInspector:
         assert 'owner' in args[0].lower()
         assert 'HR' in args[1]
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_tables_with_limit(self, database_inspector, mock_connection, mock_cursor, sample_table_data):
+        """Test table retrieval pushes the row limit into the query"""
+        mock_cursor.__iter__ = lambda self: iter(sample_table_data[:2])
+        mock_connection.cursor.return_value = mock_cursor
+        database_inspector.connection_manager.get_connection = AsyncMock(return_value=mock_connection)
+
+        tables = await database_inspector.get_tables(owner='HR', limit=2)
+
+        assert len(tables) == 2
+
+        args, kwargs = mock_cursor.execute.call_args
+        assert 'ROWNUM <= :row_limit' in args[0]
+        assert args[0].index('ORDER BY') < args[0].index('ROWNUM')
+        assert args[1] == ['HR', 2]
+
     @pytest.mark.unit
     @patch('oracle_mcp_server.server.TABLE_WHITE_LIST', ['EMPLOYEES', 'DEPARTMENTS'])
     @pytest.mark.asyncio
@@ -135,6 +152,53 @@ class TestDatabaseInspector:
         assert 'owner' in args[0].lower()
         assert 'HR' in args[1]
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_tables_columns_groups_by_table(self, database_inspector, mock_connection, mock_cursor, sample_column_data):
+        """Test batched column retrieval groups rows per table in request order"""
+        batch_rows = [row + ('EMPLOYEES',) for row in sample_column_data]
+        batch_rows.append(("DEPARTMENT_ID", "NUMBER", 22, 4, 0, "N", None, "Department ID", 1, "DEPARTMENTS"))
+        mock_cursor.__iter__ = lambda self: iter(batch_rows)
+        mock_connection.cursor.return_value = mock_cursor
+        database_inspector.connection_manager.get_connection = AsyncMock(return_value=mock_connection)
+
+        table_columns = await database_inspector.get_tables_columns(['EMPLOYEES', 'DEPARTMENTS', 'JOBS'], owner='HR')
+
+        assert list(table_columns) == ['EMPLOYEES', 'DEPARTMENTS', 'JOBS']
+        assert len(table_columns['EMPLOYEES']) == 5
+        assert table_columns['DEPARTMENTS'][0]['column_name'] == 'DEPARTMENT_ID'
+        assert table_columns['JOBS'] == []
+
+        mock_cursor.execute.assert_called_once()
+        args, kwargs = mock_cursor.execute.call_args
+        assert 'IN (:table_0,:table_1,:table_2)' in args[0]
+        assert args[1] == ['EMPLOYEES', 'DEPARTMENTS', 'JOBS', 'HR']
+        mock_connection.close.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_tables_columns_chunks_in_list(self, database_inspector, mock_connection, mock_cursor):
+        """Test batched column retrieval splits large IN lists at 1000 tables"""
+        mock_cursor.__iter__ = lambda self: iter([])
+        mock_connection.cursor.return_value = mock_cursor
+        database_inspector.connection_manager.get_connection = AsyncMock(return_value=mock_connection)
+
+        table_names = [f'T{i}' for i in range(1500)]
+        table_columns = await database_inspector.get_tables_columns(table_names)
+
+        assert len(table_columns) == 1500
+        assert mock_cursor.execute.call_count == 2
+        assert len(mock_cursor.execute.call_args_list[1][0][1]) == 500
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_tables_columns_empty(self, database_inspector):
+        """Test batched column retrieval with no tables skips the database"""
+        database_inspector.connection_manager.get_connection = AsyncMock()
+
+        assert await database_inspector.get_tables_columns([]) == {}
+        database_inspector.connection_manager.get_connection.assert_not_called()
+
     @pytest.mark.unit
     @patch('oracle_mcp_server.server.COLUMN_WHITE_LIST', ['EMPLOYEES.EMPLOYEE_ID', 'EMPLOYEES.FIRST_NAME'])
     @pytest.mark.asyncio
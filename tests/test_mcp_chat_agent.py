@@ -0,0 +1,685 @@
+import asyncio
+import gc
+import json
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from mcp_chat import agent as agent_module
+from mcp_chat.agent import DatabaseAgent, _tool_call_key, _truncate_tool_content
+from mcp_chat.llm import SingleToolCallLimitError
+
+
+def tool_call(name, arguments, call_id="call_1"):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+
+
+def reply(content=None, tool_calls=None):
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return {"choices": [{"index": 0, "message": message}]}
+
+
+def make_llm(*responses):
+    """Create a fake LLM that returns the given completions in order"""
+    llm = MagicMock()
+    llm.model = "test/model"
+    llm.supports_prompt_caching = False
+    llm.create_completion = AsyncMock(side_effect=list(responses))
+    return llm
+
+
+def make_mcp_client(call_tool):
+    """Create a fake MCP client whose tools are served by call_tool(name, arguments)"""
+    mcp_client = MagicMock()
+    mcp_client.get_tools_as_openai_format = AsyncMock(return_value=[])
+    mcp_client.call_tool = AsyncMock(side_effect=call_tool)
+    return mcp_client
+
+
+class TestToolExecution:
+    """Test cases for DatabaseAgent tool execution"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_turn_tool_calls_run_concurrently(self):
+        """Test one assistant message's tool calls overlap and keep their order"""
+        in_flight = 0
+        peak = 0
+
+        async def call_tool(name, arguments):
+            nonlocal in_flight, peak
+            if name != "describe_table":
+                return {}
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"table": arguments.get("table_name")}
+
+        llm = make_llm(
+            reply(tool_calls=[
+                tool_call("describe_table", '{"table_name": "EMP"}', "call_1"),
+                tool_call("describe_table", '{"table_name": "DEPT"}', "call_2"),
+            ]),
+            reply("Both tables described"),
+        )
+        agent = DatabaseAgent(llm, make_mcp_client(call_tool))
+
+        answer = await agent.process_query("Describe EMP and DEPT")
+
+        assert answer == "Both tables described"
+        assert peak == 2
+        tool_messages = [m for m in agent.messages if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_messages] == ["call_1", "call_2"]
+        assert [json.loads(m["content"])["table"] for m in tool_messages] == ["EMP", "DEPT"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_tool_call_reported_to_model(self):
+        """Test a failing tool call becomes an error message without sinking the others"""
+        async def call_tool(name, arguments):
+            if arguments.get("table_name") == "NOPE":
+                raise RuntimeError("table not found")
+            return {"table": arguments.get("table_name")}
+
+        llm = make_llm(
+            reply(tool_calls=[
+                tool_call("describe_table", '{"table_name": "NOPE"}', "call_1"),
+                tool_call("describe_table", '{"table_name": "EMP"}', "call_2"),
+            ]),
+            reply("Only EMP exists"),
+        )
+        agent = DatabaseAgent(llm, make_mcp_client(call_tool))
+
+        await agent.process_query("Describe NOPE and EMP")
+
+        tool_messages = [m for m in agent.messages if m["role"] == "tool"]
+        assert tool_messages[0]["content"] == "Error: table not found"
+        assert json.loads(tool_messages[1]["content"]) == {"table": "EMP"}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_results_sent_as_compact_json(self):
+        """Test dict results reach the model without indentation or spaces"""
+        llm = make_llm(
+            reply(tool_calls=[tool_call("describe_table", '{"table_name": "EMP"}')]),
+            reply("Described"),
+        )
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {"table": "EMP", "rows": [1, 2]}))
+
+        await agent.process_query("Describe EMP")
+
+        tool_message = next(m for m in agent.messages if m["role"] == "tool")
+        assert tool_message["content"] == '{"table":"EMP","rows":[1,2]}'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_concurrency_is_bounded(self):
+        """Test no more than max_tool_concurrency tool calls run at once"""
+        in_flight = 0
+        peak = 0
+
+        async def call_tool(name, arguments):
+            nonlocal in_flight, peak
+            if name != "describe_table":
+                return {}
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"table": arguments.get("table_name")}
+
+        tables = ["A", "B", "C", "D", "E"]
+        llm = make_llm(
+            reply(tool_calls=[
+                tool_call("describe_table", json.dumps({"table_name": table}), f"call_{table}")
+                for table in tables
+            ]),
+            reply("Described"),
+        )
+        mcp_client = make_mcp_client(call_tool)
+        agent = DatabaseAgent(llm, mcp_client, max_tool_concurrency=2)
+
+        await agent.process_query("Describe five tables")
+
+        assert peak == 2
+        tool_messages = [m for m in agent.messages if m["role"] == "tool"]
+        assert [json.loads(m["content"])["table"] for m in tool_messages] == tables
+
+
+class TestConversationHistory:
+    """Test cases for DatabaseAgent's prompt prefix and turn history"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_turn_not_committed(self):
+        """Test a turn that raises is left out of the history sent with the next one"""
+        llm = make_llm(reply("First answer"), RuntimeError("provider down"), reply("Third answer"))
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {}))
+
+        await agent.process_query("first question")
+        with pytest.raises(RuntimeError):
+            await agent.process_query("second question")
+        await agent.process_query("third question")
+
+        sent = llm.create_completion.call_args.kwargs["messages"]
+        assert [m["role"] for m in sent] == ["system", "user", "assistant", "user"]
+        assert [m["content"] for m in sent[1:]] == ["first question", "First answer", "third question"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cache_breakpoints_for_prompt_caching_models(self):
+        """Test the system prompt and last committed message carry cache_control markers"""
+        llm = make_llm(reply("First answer"), reply("Second answer"))
+        llm.supports_prompt_caching = True
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {}))
+
+        await agent.process_query("first question")
+        await agent.process_query("second question")
+
+        sent = llm.create_completion.call_args.kwargs["messages"]
+        marked = [m for m in sent if isinstance(m["content"], list)]
+        assert [m["role"] for m in marked] == ["system", "assistant"]
+        assert marked[1]["content"] == [
+            {"type": "text", "text": "First answer", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert sent[-1] == {"role": "user", "content": "second question"}
+        # The stored history itself stays unmarked
+        assert all(isinstance(m["content"], str) for m in agent.messages)
+
+
+class TestDirectAnswers:
+    """Test cases for inputs DatabaseAgent handles without a first LLM call"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query", ["help", "  HELP ", ""])
+    async def test_help_answered_without_llm(self, query):
+        """Test help and empty input return the help text with no completion"""
+        llm = make_llm()
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {}))
+
+        answer = await agent.process_query(query)
+
+        assert "list tables" in answer
+        llm.create_completion.assert_not_called()
+        assert agent.messages[-2:] == [
+            {"role": "user", "content": query},
+            {"role": "assistant", "content": answer},
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query", ["list tables", "Show Tables", " list table "])
+    async def test_list_tables_runs_tool_directly(self, query):
+        """Test list-tables requests call the tool first and the LLM only to summarize"""
+        mcp_client = make_mcp_client(lambda name, arguments: {"tables": ["EMP"]})
+        llm = make_llm(reply("There is one table: EMP"))
+        agent = DatabaseAgent(llm, mcp_client)
+
+        answer = await agent.process_query(query)
+
+        assert answer == "There is one table: EMP"
+        mcp_client.call_tool.assert_called_once_with("list_tables", {})
+        llm.create_completion.assert_called_once()
+
+        assistant, tool_message = agent.messages[-3:-1]
+        call = assistant["tool_calls"][0]
+        assert call["function"] == {"name": "list_tables", "arguments": "{}"}
+        assert tool_message["tool_call_id"] == call["id"]
+        assert tool_message["content"] == '{"tables":["EMP"]}'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_repeated_list_tables_ids_unique(self):
+        """Test repeating a list-tables request never reuses a tool call id"""
+        llm = make_llm(reply("First"), reply("Second"))
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {"tables": ["EMP"]}))
+
+        await agent.process_query("list tables")
+        await agent.process_query("list tables")
+
+        call_ids = [
+            call["id"] for message in agent.messages for call in message.get("tool_calls", [])
+        ]
+        assert len(call_ids) == 2
+        assert len(set(call_ids)) == 2
+
+
+class TestCompletionWithTimeout:
+    """Test cases for DatabaseAgent._completion_with_timeout"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stalled_call_is_retried(self):
+        """Test a call that exceeds per_call_timeout is abandoned and tried again"""
+        async def stall_once(messages, tools=None, **kwargs):
+            if llm.create_completion.call_count == 1:
+                await asyncio.sleep(1)
+            return reply("Answer")
+
+        llm = make_llm()
+        llm.create_completion.side_effect = stall_once
+        agent = DatabaseAgent(llm, MagicMock(), per_call_timeout=0.02, max_retries=1)
+
+        response = await agent._completion_with_timeout([{"role": "user", "content": "question"}])
+
+        assert response == reply("Answer")
+        assert llm.create_completion.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_raises_after_max_retries(self):
+        """Test TimeoutError is raised once every attempt has stalled"""
+        async def stall(messages, tools=None, **kwargs):
+            await asyncio.sleep(1)
+
+        llm = make_llm()
+        llm.create_completion.side_effect = stall
+        agent = DatabaseAgent(llm, MagicMock(), per_call_timeout=0.02, max_retries=2)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await agent._completion_with_timeout([{"role": "user", "content": "question"}])
+
+        assert llm.create_completion.call_count == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_streaming_answer_is_not_restarted(self):
+        """Test a completion that has started streaming runs past per_call_timeout"""
+        async def stream(messages, tools=None, on_token=None, **kwargs):
+            for token in ["Long ", "answer"]:
+                on_token(token)
+                await asyncio.sleep(0.05)
+            return reply("Long answer")
+
+        llm = make_llm()
+        llm.create_completion.side_effect = stream
+        tokens = []
+        agent = DatabaseAgent(llm, MagicMock(), per_call_timeout=0.02)
+
+        response = await agent._completion_with_timeout(
+            [{"role": "user", "content": "question"}], on_token=tokens.append
+        )
+
+        assert response == reply("Long answer")
+        assert tokens == ["Long ", "answer"]
+        llm.create_completion.assert_called_once()
+
+
+class TestSingleToolCallFallback:
+    """Test cases for the fallback used with single-tool-call backends such as vLLM"""
+
+    TOOLS = [{"type": "function", "function": {"name": name}} for name in ("list_tables", "describe_table", "execute_query")]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "query, tool_name",
+        [
+            ("Which tables are there?", "list_tables"),
+            ("Describe the EMP structure", "describe_table"),
+            ("Run a query for the top salary", "execute_query"),
+            ("Who earns the most?", "list_tables"),
+        ],
+    )
+    async def test_forces_tool_picked_from_query(self, query, tool_name):
+        """Test the retry offers one tool, chosen from the question, without a probe call"""
+        llm = make_llm(SingleToolCallLimitError("This model only supports one tool call per response"), reply("Done"))
+        mcp_client = make_mcp_client(lambda name, arguments: {})
+        mcp_client.get_tools_as_openai_format.return_value = self.TOOLS
+        agent = DatabaseAgent(llm, mcp_client)
+
+        answer = await agent.process_query(query)
+
+        assert answer == "Done"
+        assert llm.create_completion.call_count == 2
+        retry = llm.create_completion.call_args.kwargs
+        assert retry["tools"] == [{"type": "function", "function": {"name": tool_name}}]
+        assert retry["tool_choice"] == {"type": "function", "function": {"name": tool_name}}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_answers_plainly_without_a_matching_tool(self):
+        """Test the turn still ends cleanly when the chosen tool is not available"""
+        llm = make_llm(SingleToolCallLimitError("This model only supports one tool call per response"))
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {}))
+
+        answer = await agent.process_query("Describe the EMP structure")
+
+        assert "one tool call at a time" in answer
+        llm.create_completion.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_other_errors_propagate(self):
+        """Test unrelated completion errors are not treated as the single-tool-call limit"""
+        llm = make_llm(Exception("rate limited"))
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {}))
+
+        with pytest.raises(Exception, match="rate limited"):
+            await agent.process_query("Describe the EMP structure")
+
+
+class TestStreaming:
+    """Test cases for streaming answers to the console"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_final_answer_streamed_to_console(self):
+        """Test tokens go straight to the console and the answer is flagged as streamed"""
+        async def stream(messages, tools=None, on_token=None, **kwargs):
+            for token in ["Hel", "lo"]:
+                on_token(token)
+            return reply("Hello")
+
+        llm = make_llm()
+        llm.create_completion.side_effect = stream
+        console = MagicMock()
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {}), console)
+
+        answer = await agent.process_query("Say hello")
+
+        assert answer == "Hello"
+        assert agent.last_response_streamed is True
+        assert [call.args[0] for call in console.out.call_args_list] == ["Hel", "lo"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_no_console_streams_silently(self):
+        """Test completions still stream without a console, but nothing is printed"""
+        async def stream(messages, tools=None, on_token=None, **kwargs):
+            on_token("Hello")
+            return reply("Hello")
+
+        llm = make_llm()
+        llm.create_completion.side_effect = stream
+        agent = DatabaseAgent(llm, make_mcp_client(lambda name, arguments: {}))
+
+        answer = await agent.process_query("Say hello")
+
+        assert answer == "Hello"
+        assert agent.last_response_streamed is False
+
+
+class TestTruncateToolContent:
+    """Test cases for _truncate_tool_content"""
+
+    @pytest.mark.unit
+    def test_small_content_unchanged(self):
+        """Test content within the limit is returned as is"""
+        result = {"rows": [[1]]}
+        content = json.dumps(result)
+
+        assert _truncate_tool_content(result, content) is content
+
+    @pytest.mark.unit
+    def test_keeps_head_and_tail_of_largest_list(self):
+        """Test long row lists keep their first and last rows with a total"""
+        rows = [[i, "x" * 20] for i in range(1000)]
+        result = {"columns": ["ID", "NAME"], "rows": rows}
+
+        truncated = json.loads(_truncate_tool_content(result, json.dumps(result)))
+
+        expected_rows = rows[:agent_module._TRUNCATE_HEAD_ITEMS] + rows[-agent_module._TRUNCATE_TAIL_ITEMS:]
+        assert truncated["rows"] == expected_rows
+        assert truncated["columns"] == ["ID", "NAME"]
+        assert truncated["_truncated"] is True
+        assert truncated["_total_rows"] == 1000
+
+    @pytest.mark.unit
+    def test_falls_back_to_character_slicing(self):
+        """Test content with no shrinkable list keeps its first and last characters"""
+        content = "a" * agent_module._MAX_TOOL_CHARS + "b" * 100
+
+        truncated = _truncate_tool_content(content, content)
+
+        omitted = len(content) - agent_module._TRUNCATE_HEAD_CHARS - agent_module._TRUNCATE_TAIL_CHARS
+        assert truncated.startswith("a" * agent_module._TRUNCATE_HEAD_CHARS + "...")
+        assert f"<truncated {omitted} chars>" in truncated
+        assert truncated.endswith(content[-agent_module._TRUNCATE_TAIL_CHARS:])
+        assert len(truncated) < len(content)
+
+    @pytest.mark.unit
+    def test_falls_back_when_rows_are_too_wide(self):
+        """Test truncated rows that are still too large fall back to character slicing"""
+        rows = [["x" * 1000] for _ in range(100)]
+        result = {"rows": rows}
+
+        truncated = _truncate_tool_content(result, json.dumps(result))
+
+        assert "<truncated" in truncated
+        assert len(truncated) < agent_module._MAX_TOOL_CHARS
+
+
+class TestToolCallKey:
+    """Test cases for _tool_call_key and duplicate tool calls"""
+
+    @pytest.mark.unit
+    def test_canonicalizes_arguments(self):
+        """Test argument order and whitespace don't change the key"""
+        first = tool_call("describe_table", '{"table_name": "EMP", "owner": "HR"}')
+        second = tool_call("describe_table", '{"owner":"HR","table_name":"EMP"}', "call_2")
+
+        assert _tool_call_key(first) == _tool_call_key(second)
+        assert _tool_call_key(first) != _tool_call_key(tool_call("describe_table", '{"table_name": "DEPT"}'))
+        assert _tool_call_key(tool_call("list_tables", "{ }")) == ("list_tables", "{}")
+
+    @pytest.mark.unit
+    def test_invalid_json_uses_raw_arguments(self):
+        """Test unparseable arguments are used verbatim"""
+        assert _tool_call_key(tool_call("execute_query", "{not json")) == ("execute_query", "{not json")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_duplicate_calls_run_once(self):
+        """Test duplicate tool calls in one turn share a single MCP call"""
+        mcp_client = make_mcp_client(lambda name, arguments: {"tables": ["EMP"]})
+        agent = DatabaseAgent(make_llm(), mcp_client)
+
+        await agent._execute_tool_calls([
+            tool_call("list_tables", "{}", "call_1"),
+            tool_call("list_tables", "{ }", "call_2"),
+        ])
+
+        mcp_client.call_tool.assert_called_once_with("list_tables", {})
+        assert [m["tool_call_id"] for m in agent._pending] == ["call_1", "call_2"]
+        assert agent._pending[0]["content"] == agent._pending[1]["content"]
+
+
+class TestCompactHistory:
+    """Test cases for DatabaseAgent history compaction"""
+
+    @staticmethod
+    def turn(number):
+        return [
+            {"role": "user", "content": f"question {number}"},
+            {"role": "assistant", "content": None, "tool_calls": [tool_call("list_tables", "{}", f"call_{number}")]},
+            {"role": "tool", "tool_call_id": f"call_{number}", "name": "list_tables", "content": "TOOL PAYLOAD"},
+            {"role": "assistant", "content": f"answer {number}"},
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_summarizes_whole_older_turns(self):
+        """Test all but the recent turns become one summary, split at a user message"""
+        llm = make_llm(reply("SUMMARY"))
+        agent = DatabaseAgent(llm, MagicMock(), keep_recent_turns=2)
+        agent._committed = self.turn(1) + self.turn(2) + self.turn(3)
+
+        await agent._compact_history()
+
+        assert agent._committed[0] == {
+            "role": "assistant",
+            "content": "Summary of the earlier conversation:\nSUMMARY",
+        }
+        assert agent._committed[1:] == self.turn(2) + self.turn(3)
+
+        transcript = llm.create_completion.call_args.kwargs["messages"][-1]["content"]
+        assert "question 1" in transcript and "answer 1" in transcript
+        assert "TOOL PAYLOAD" not in transcript
+        assert "question 2" not in transcript
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_few_turns_left_alone(self):
+        """Test history with no more than keep_recent_turns turns is not compacted"""
+        llm = make_llm()
+        agent = DatabaseAgent(llm, MagicMock(), keep_recent_turns=2)
+        agent._committed = self.turn(1) + self.turn(2)
+
+        await agent._compact_history()
+
+        assert agent._committed == self.turn(1) + self.turn(2)
+        llm.create_completion.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_summary_drops_older_turns(self):
+        """Test a failed summarization falls back to a plain sliding window"""
+        llm = make_llm(RuntimeError("provider down"))
+        agent = DatabaseAgent(llm, MagicMock(), keep_recent_turns=1)
+        agent._committed = self.turn(1) + self.turn(2)
+
+        await agent._compact_history()
+
+        assert agent._committed == self.turn(2)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_history_over_budget_is_compacted(self):
+        """Test finished turns are summarized once the history exceeds max_context_tokens"""
+        llm = make_llm(reply("First answer"), reply("Second answer"), reply("SUMMARY"))
+        agent = DatabaseAgent(
+            llm, make_mcp_client(lambda name, arguments: {}), max_context_tokens=0, keep_recent_turns=1
+        )
+
+        await agent.process_query("first question")
+        await agent.process_query("second question")
+        await agent._finish_compaction()
+
+        assert agent._committed == [
+            {"role": "assistant", "content": "Summary of the earlier conversation:\nSUMMARY"},
+            {"role": "user", "content": "second question"},
+            {"role": "assistant", "content": "Second answer"},
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_compaction_runs_after_the_answer(self):
+        """Test an over-budget commit compacts in the background before the next turn"""
+        llm = make_llm(reply("SUMMARY"))
+        agent = DatabaseAgent(llm, MagicMock(), max_context_tokens=0, keep_recent_turns=1)
+        agent._committed = self.turn(1)
+        agent._pending = self.turn(2)
+
+        agent._commit_turn()
+
+        assert agent._compaction is not None
+        assert agent._committed == self.turn(1) + self.turn(2)
+
+        await agent._finish_compaction()
+
+        assert agent._compaction is None
+        assert agent._committed[0]["content"].endswith("SUMMARY")
+        assert agent._committed[1:] == self.turn(2)
+
+
+class TestSpeculativeListTables:
+    """Test cases for prefetching list_tables on the first question"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_prefetch_reused_by_matching_call(self):
+        """Test the model's list_tables call awaits the prefetch instead of calling again"""
+        events = []
+
+        async def call_tool(name, arguments):
+            events.append(f"call {name}")
+            return {"tables": ["EMP"]}
+
+        async def complete(messages, tools=None, **kwargs):
+            events.append("completion")
+            if len(messages) == 2:
+                return reply(tool_calls=[tool_call("list_tables", "{ }")])
+            return reply("There is one table: EMP")
+
+        llm = make_llm()
+        llm.create_completion.side_effect = complete
+        mcp_client = make_mcp_client(call_tool)
+        agent = DatabaseAgent(llm, mcp_client)
+
+        answer = await agent.process_query("What data do we have?")
+
+        assert answer == "There is one table: EMP"
+        assert events == ["call list_tables", "completion", "completion"]
+        mcp_client.call_tool.assert_called_once_with("list_tables", {})
+        assert agent._speculative == {}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unclaimed_prefetch_cancelled(self):
+        """Test a prefetch still running when the turn ends is cancelled"""
+        cancelled = asyncio.Event()
+
+        async def call_tool(name, arguments):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def complete(messages, tools=None, **kwargs):
+            await asyncio.sleep(0)  # let the prefetch start
+            return reply("Hello")
+
+        llm = make_llm()
+        llm.create_completion.side_effect = complete
+        agent = DatabaseAgent(llm, make_mcp_client(call_tool))
+
+        await agent.process_query("Say hello")
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert agent._speculative == {}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_no_prefetch_once_history_exists(self):
+        """Test only the first question of a conversation prefetches"""
+        mcp_client = make_mcp_client(lambda name, arguments: {})
+        agent = DatabaseAgent(make_llm(reply("First"), reply("Second")), mcp_client)
+
+        await agent.process_query("first question")
+        await agent.process_query("second question")
+
+        mcp_client.call_tool.assert_called_once_with("list_tables", {})
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_prefetch_error_retrieved(self):
+        """Test an unclaimed prefetch that failed does not log an unretrieved exception"""
+        loop = asyncio.get_running_loop()
+        reported = []
+        loop.set_exception_handler(lambda loop, context: reported.append(context))
+
+        async def call_tool(name, arguments):
+            raise RuntimeError("database unavailable")
+
+        async def complete(messages, tools=None, **kwargs):
+            await asyncio.sleep(0.01)  # let the prefetch fail first
+            return reply("Hello")
+
+        llm = make_llm()
+        llm.create_completion.side_effect = complete
+        agent = DatabaseAgent(llm, make_mcp_client(call_tool))
+
+        try:
+            await agent.process_query("Say hello")
+            gc.collect()
+            await asyncio.sleep(0)
+        finally:
+            loop.set_exception_handler(None)
+
+        assert reported == []
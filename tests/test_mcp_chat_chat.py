@@ -0,0 +1,127 @@
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from mcp_chat.chat import run_batch, run_chat_loop
+
+
+def make_llm(delays):
+    """Create a fake LLM answering each question after the delay given for it"""
+    in_flight = 0
+    llm = MagicMock()
+    llm.model = "test/model"
+    llm.supports_prompt_caching = False
+    llm.peak = 0
+
+    async def create_completion(messages, tools=None, **kwargs):
+        nonlocal in_flight
+        question = messages[-1]["content"]
+        if question == "fail":
+            raise RuntimeError("provider down")
+        in_flight += 1
+        llm.peak = max(llm.peak, in_flight)
+        await asyncio.sleep(delays.get(question, 0))
+        in_flight -= 1
+        message = {"role": "assistant", "content": f"answer to {question}"}
+        return {"choices": [{"index": 0, "message": message}]}
+
+    llm.create_completion = AsyncMock(side_effect=create_completion)
+    return llm
+
+
+def make_mcp_client():
+    mcp_client = MagicMock()
+    mcp_client.get_tools_as_openai_format = AsyncMock(return_value=[])
+    mcp_client.call_tool = AsyncMock(return_value={})
+    return mcp_client
+
+
+def printed(console):
+    """Text of everything printed, with Markdown renderables reduced to their source"""
+    return [getattr(call.args[0], "markup", call.args[0]) for call in console.print.call_args_list]
+
+
+class TestRunBatch:
+    """Test cases for answering piped questions with run_batch"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_answers_printed_in_input_order(self):
+        """Test answers that finish out of order are printed in question order"""
+        llm = make_llm({"first": 0.05, "second": 0.0, "third": 0.02})
+
+        with patch("mcp_chat.chat.console") as console:
+            await run_batch(llm, make_mcp_client(), ["first", "second", "third"], parallel=3)
+
+        output = printed(console)
+        answers = [line for line in output if str(line).startswith("answer to")]
+        assert answers == ["answer to first", "answer to second", "answer to third"]
+        assert llm.peak == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_parallel_bounds_concurrency(self):
+        """Test no more than `parallel` questions are answered at once"""
+        llm = make_llm({"a": 0.02, "b": 0.02, "c": 0.02, "d": 0.02})
+
+        with patch("mcp_chat.chat.console"):
+            await run_batch(llm, make_mcp_client(), ["a", "b", "c", "d"], parallel=2)
+
+        assert llm.peak == 2
+        assert llm.create_completion.call_count == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_error_reported_without_sinking_the_batch(self):
+        """Test one failing question is reported while the others are still answered"""
+        llm = make_llm({})
+
+        with patch("mcp_chat.chat.console") as console:
+            await run_batch(llm, make_mcp_client(), ["fail", "ok"], parallel=2)
+
+        output = [str(line) for line in printed(console)]
+        assert any("Error:" in line and "provider down" in line for line in output)
+        assert "answer to ok" in output
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_streaming_answer_outlasts_per_call_timeout(self):
+        """Test a batch answer still streaming after timeout / 3 is not restarted"""
+        async def stream(messages, tools=None, on_token=None, **kwargs):
+            for token in ["slow ", "answer"]:
+                on_token(token)
+                await asyncio.sleep(0.08)
+            message = {"role": "assistant", "content": "slow answer"}
+            return {"choices": [{"index": 0, "message": message}]}
+
+        llm = make_llm({})
+        llm.create_completion.side_effect = stream
+
+        with patch("mcp_chat.chat.console") as console:
+            await run_batch(llm, make_mcp_client(), ["question"], parallel=1, timeout=0.3)
+
+        assert "slow answer" in printed(console)
+        llm.create_completion.assert_called_once()
+
+
+class TestRunChatLoop:
+    """Test cases for the interactive chat loop"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_event_loop_runs_while_prompting(self):
+        """Test background tasks make progress while the loop waits for input"""
+        background_ran = threading.Event()
+        waited = []
+
+        def ask(prompt):
+            waited.append(background_ran.wait(timeout=1))
+            return "exit"
+
+        asyncio.get_running_loop().call_soon(background_ran.set)
+        with patch("mcp_chat.chat.console"), patch("rich.prompt.Prompt.ask", side_effect=ask):
+            await run_chat_loop(make_llm({}), make_mcp_client())
+
+        assert waited == [True]
@@ -0,0 +1,141 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, AsyncMock
+
+from openai import BadRequestError
+
+from mcp_chat.llm import OpenRouterLLM, SingleToolCallLimitError
+
+
+def chunk(content=None, tool_calls=None, finish_reason=None):
+    """Build a streamed chat completion chunk with a single choice"""
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+
+def tool_call_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+async def stream_of(*chunks):
+    for item in chunks:
+        yield item
+
+
+@pytest.fixture
+def llm():
+    """Create an OpenRouterLLM whose SDK client is replaced by a mock"""
+    llm = OpenRouterLLM(api_key="test-key", model="test/model")
+    llm.client = MagicMock()
+    llm.client.chat.completions.create = AsyncMock()
+    return llm
+
+
+class TestOpenRouterLLM:
+    """Test cases for OpenRouterLLM"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_completion_without_streaming(self, llm):
+        """Test a plain request returns the SDK response as a dict"""
+        response = MagicMock()
+        response.model_dump.return_value = {"choices": []}
+        llm.client.chat.completions.create.return_value = response
+
+        result = await llm.create_completion([{"role": "user", "content": "hi"}])
+
+        assert result == {"choices": []}
+        assert "stream" not in llm.client.chat.completions.create.call_args.kwargs
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_completion_streams_content(self, llm):
+        """Test streamed content is forwarded token by token and joined into the message"""
+        llm.client.chat.completions.create.return_value = stream_of(
+            chunk(content="Hel"),
+            SimpleNamespace(choices=[]),  # e.g. a trailing usage chunk
+            chunk(content="lo"),
+            chunk(finish_reason="stop"),
+        )
+        tokens = []
+
+        result = await llm.create_completion([{"role": "user", "content": "hi"}], on_token=tokens.append)
+
+        assert tokens == ["Hel", "lo"]
+        assert llm.client.chat.completions.create.call_args.kwargs["stream"] is True
+        assert result == {
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "Hello"},
+                    "finish_reason": "stop",
+                }
+            ]
+        }
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_completion_joins_tool_call_fragments(self, llm):
+        """Test tool call pieces are joined per index and returned in index order"""
+        llm.client.chat.completions.create.return_value = stream_of(
+            chunk(tool_calls=[tool_call_delta(1, id="call_b", name="describe_table", arguments='{"table_')]),
+            chunk(tool_calls=[tool_call_delta(0, id="call_a", name="list_tables", arguments="{}")]),
+            chunk(tool_calls=[tool_call_delta(1, arguments='name": "EMP"}')]),
+            chunk(finish_reason="tool_calls"),
+        )
+        on_token = MagicMock()
+
+        result = await llm.create_completion([{"role": "user", "content": "hi"}], on_token=on_token)
+
+        choice = result["choices"][0]
+        assert choice["finish_reason"] == "tool_calls"
+        assert choice["message"]["content"] is None
+        assert choice["message"]["tool_calls"] == [
+            {"id": "call_a", "type": "function", "function": {"name": "list_tables", "arguments": "{}"}},
+            {"id": "call_b", "type": "function", "function": {"name": "describe_table", "arguments": '{"table_name": "EMP"}'}},
+        ]
+        on_token.assert_not_called()
+
+
+class TestSingleToolCallLimit:
+    """Test cases for translating single-tool-call rejections into SingleToolCallLimitError"""
+
+    @staticmethod
+    def bad_request(message):
+        return BadRequestError(message, response=MagicMock(status_code=400), body=None)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "message",
+        ["This model only supports one tool call per response", "Only a SINGLE TOOL CALL is allowed"],
+    )
+    async def test_limit_raises_typed_error(self, llm, message):
+        """Test a 400 naming the single-tool-call limit becomes SingleToolCallLimitError"""
+        llm.client.chat.completions.create.side_effect = self.bad_request(message)
+
+        with pytest.raises(SingleToolCallLimitError) as excinfo:
+            await llm.create_completion([{"role": "user", "content": "hi"}], tools=[{"type": "function"}])
+
+        assert isinstance(excinfo.value.__cause__, BadRequestError)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_limit_detected_when_streaming(self, llm):
+        """Test the streamed request path is translated the same way"""
+        llm.client.chat.completions.create.side_effect = self.bad_request("model only supports one tool call")
+
+        with pytest.raises(SingleToolCallLimitError):
+            await llm.create_completion([{"role": "user", "content": "hi"}], on_token=MagicMock())
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_other_bad_requests_propagate(self, llm):
+        """Test unrelated 400 errors are raised unchanged"""
+        error = self.bad_request("context length exceeded")
+        llm.client.chat.completions.create.side_effect = error
+
+        with pytest.raises(BadRequestError) as excinfo:
+            await llm.create_completion([{"role": "user", "content": "hi"}])
+
+        assert excinfo.value is error
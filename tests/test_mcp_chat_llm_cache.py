@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from mcp_chat.llm_cache import CompletionCache
+
+
+def make_llm(model="test/model"):
+    """Create a fake LLM whose completions echo the last message"""
+    llm = MagicMock()
+    llm.model = model
+    llm.create_completion = AsyncMock(
+        side_effect=lambda messages, **kwargs: {"content": messages[-1]["content"]}
+    )
+    return llm
+
+
+def user(content):
+    return [{"role": "user", "content": content}]
+
+
+class TestCompletionCache:
+    """Test cases for CompletionCache class"""
+
+    @pytest.mark.unit
+    def test_make_key_is_stable(self):
+        """Test keys ignore dict ordering but not content, tools or options"""
+        key = CompletionCache.make_key("m", [{"role": "user", "content": "hi"}], temperature=0)
+
+        assert key == CompletionCache.make_key("m", [{"content": "hi", "role": "user"}], temperature=0)
+        assert key != CompletionCache.make_key("m", user("hello"), temperature=0)
+        assert key != CompletionCache.make_key("other", user("hi"), temperature=0)
+        assert key != CompletionCache.make_key("m", user("hi"), tools=[{"name": "t"}], temperature=0)
+        assert key != CompletionCache.make_key("m", user("hi"), temperature=1)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_complete_hit_skips_llm(self):
+        """Test an identical request is served from the cache"""
+        llm = make_llm()
+        cache = CompletionCache()
+
+        first = await cache.complete(llm, user("hi"))
+        second = await cache.complete(llm, user("hi"))
+
+        assert first == second == {"content": "hi"}
+        llm.create_completion.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_complete_expires_after_ttl(self):
+        """Test entries older than the TTL are fetched again"""
+        llm = make_llm()
+        cache = CompletionCache(ttl=10)
+
+        with patch("mcp_chat.llm_cache.time.monotonic", return_value=100.0):
+            await cache.complete(llm, user("hi"))
+        with patch("mcp_chat.llm_cache.time.monotonic", return_value=109.0):
+            await cache.complete(llm, user("hi"))
+        assert llm.create_completion.call_count == 1
+
+        with patch("mcp_chat.llm_cache.time.monotonic", return_value=111.0):
+            await cache.complete(llm, user("hi"))
+        assert llm.create_completion.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_complete_evicts_least_recently_used(self):
+        """Test the least recently used entry is dropped once max_size is exceeded"""
+        llm = make_llm()
+        cache = CompletionCache(max_size=2)
+
+        await cache.complete(llm, user("a"))
+        await cache.complete(llm, user("b"))
+        await cache.complete(llm, user("a"))  # "a" is now the most recent
+        await cache.complete(llm, user("c"))  # evicts "b"
+        assert llm.create_completion.call_count == 3
+
+        await cache.complete(llm, user("a"))
+        assert llm.create_completion.call_count == 3
+
+        await cache.complete(llm, user("b"))
+        assert llm.create_completion.call_count == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_clear(self):
+        """Test clear drops every cached completion"""
+        llm = make_llm()
+        cache = CompletionCache()
+
+        await cache.complete(llm, user("hi"))
+        cache.clear()
+        await cache.complete(llm, user("hi"))
+
+        assert llm.create_completion.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_complete_streams_only_on_miss(self):
+        """Test on_token is passed through on a miss and not called on a hit"""
+        llm = make_llm()
+        cache = CompletionCache()
+        on_token = MagicMock()
+
+        await cache.complete(llm, user("hi"), on_token=on_token)
+        assert llm.create_completion.call_args.kwargs["on_token"] is on_token
+
+        await cache.complete(llm, user("hi"), on_token=MagicMock())
+        llm.create_completion.assert_called_once()
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from mcp_chat.mcp_client import MCPClient
+
+
+def tool_result(payload):
+    """Build an MCP CallToolResult-like object with one text content item"""
+    text = payload if isinstance(payload, str) else json.dumps(payload)
+    return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+@pytest.fixture
+def mcp_client():
+    """Create an MCPClient connected to a fake session that echoes its arguments"""
+    client = MCPClient(cache_size=2)
+    client.session = MagicMock()
+    client.session.call_tool = AsyncMock(
+        side_effect=lambda name, arguments: tool_result({"tool": name, **arguments})
+    )
+    return client
+
+
+class TestMCPClientCache:
+    """Test cases for MCPClient's metadata result cache"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_repeated_lookup_served_from_cache(self, mcp_client):
+        """Test a repeated metadata call with the same arguments skips the server"""
+        first = await mcp_client.call_tool("describe_table", {"table_name": "EMP", "owner": "HR"})
+        second = await mcp_client.call_tool("describe_table", {"owner": "HR", "table_name": "EMP"})
+
+        assert first == second == {"tool": "describe_table", "table_name": "EMP", "owner": "HR"}
+        mcp_client.session.call_tool.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_callers_cannot_modify_cached_result(self, mcp_client):
+        """Test changing a returned result does not change later cache hits"""
+        first = await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+        first["table_name"] = "CHANGED"
+        second = await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+        second["extra"] = True
+        third = await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+
+        assert third == {"tool": "describe_table", "table_name": "EMP"}
+        mcp_client.session.call_tool.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_non_metadata_tools_not_cached(self, mcp_client):
+        """Test query results always go to the server"""
+        await mcp_client.call_tool("execute_query", {"sql": "SELECT 1 FROM dual"})
+        await mcp_client.call_tool("execute_query", {"sql": "SELECT 1 FROM dual"})
+
+        assert mcp_client.session.call_tool.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, mcp_client):
+        """Test the least recently used result is dropped once cache_size is exceeded"""
+        for table in ["A", "B", "A", "C"]:  # "A" is reused, so "B" is evicted by "C"
+            await mcp_client.call_tool("describe_table", {"table_name": table})
+        assert mcp_client.session.call_tool.call_count == 3
+
+        await mcp_client.call_tool("describe_table", {"table_name": "A"})
+        assert mcp_client.session.call_tool.call_count == 3
+
+        await mcp_client.call_tool("describe_table", {"table_name": "B"})
+        assert mcp_client.session.call_tool.call_count == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_error_results_not_cached(self, mcp_client):
+        """Test plain-text (error) results are fetched again on the next call"""
+        mcp_client.session.call_tool.side_effect = None
+        mcp_client.session.call_tool.return_value = tool_result("Error: table not found")
+
+        result = await mcp_client.call_tool("describe_table", {"table_name": "NOPE"})
+        await mcp_client.call_tool("describe_table", {"table_name": "NOPE"})
+
+        assert result == {"result": "Error: table not found"}
+        assert mcp_client.session.call_tool.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidate_cache(self, mcp_client):
+        """Test invalidate_cache drops every cached result"""
+        await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+        mcp_client.invalidate_cache()
+        await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+
+        assert mcp_client.session.call_tool.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stop_server_clears_cache(self, mcp_client):
+        """Test disconnecting drops cached results from the old session"""
+        session = mcp_client.session
+        await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+
+        await mcp_client.stop_server()
+        mcp_client.session = session
+        await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+
+        assert session.call_tool.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, mcp_client):
+        """Test results older than cache_ttl are fetched again"""
+        mcp_client.cache_ttl = 10
+
+        with patch("mcp_chat.mcp_client.time.monotonic", return_value=100.0):
+            await mcp_client.call_tool("list_tables", {})
+        with patch("mcp_chat.mcp_client.time.monotonic", return_value=109.0):
+            await mcp_client.call_tool("list_tables", {})
+        assert mcp_client.session.call_tool.call_count == 1
+
+        with patch("mcp_chat.mcp_client.time.monotonic", return_value=111.0):
+            await mcp_client.call_tool("list_tables", {})
+        assert mcp_client.session.call_tool.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalidate_cache_single_tool(self, mcp_client):
+        """Test invalidate_cache(tool_name) keeps other tools' results"""
+        await mcp_client.call_tool("list_tables", {})
+        await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+
+        mcp_client.invalidate_cache("list_tables")
+        await mcp_client.call_tool("list_tables", {})
+        await mcp_client.call_tool("describe_table", {"table_name": "EMP"})
+
+        assert [call.args[0] for call in mcp_client.session.call_tool.call_args_list] == [
+            "list_tables",
+            "describe_table",
+            "list_tables",
+        ]
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 import oracledb
@@ -166,6 +169,20 @@ class TestOracleConnection:
         assert oracle_conn.pool == mock_pool
         mock_pool.acquire.assert_called_once()
 
+    @pytest.mark.unit
+    @patch('oracledb.create_pool')
+    @pytest.mark.asyncio
+    async def test_get_connection_concurrent_callers_share_pool(self, mock_create_pool):
+        """Test concurrent first callers create the pool only once"""
+        mock_create_pool.return_value = MagicMock()
+
+        oracle_conn = OracleConnection("testuser/testpass@localhost:1521/testdb")
+
+        await asyncio.gather(*(oracle_conn.get_connection() for _ in range(3)))
+
+        mock_create_pool.assert_called_once()
+        assert oracle_conn.pool.acquire.call_count == 3
+
     @pytest.mark.unit
     def test_close_pool_with_pool(self):
         """Test closing pool when it exists"""
@@ -188,6 +205,48 @@ class TestOracleConnection:
         # Should not raise an exception
         oracle_conn.close_pool()
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_run_blocking_uses_dedicated_executor(self):
+        """Test blocking calls run on the oracle-io thread pool until the pool closes"""
+        oracle_conn = OracleConnection("testuser/testpass@localhost:1521/testdb")
+
+        thread_name = await oracle_conn.run_blocking(lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("oracle-io")
+        assert oracle_conn._executor._max_workers == OracleConnection.POOL_MAX_SIZE
+
+        oracle_conn.close_pool()
+
+        assert oracle_conn._executor is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_connection_waits_without_blocking_io(self):
+        """Test callers waiting for a connection don't starve those holding one"""
+        slots = threading.BoundedSemaphore(2)
+
+        def acquire():
+            slots.acquire()
+            return MagicMock()
+
+        mock_pool = MagicMock()
+        mock_pool.acquire.side_effect = acquire
+
+        oracle_conn = OracleConnection("testuser/testpass@localhost:1521/testdb")
+        oracle_conn.POOL_MAX_SIZE = 2
+        oracle_conn.pool = mock_pool
+
+        async def query():
+            await oracle_conn.get_connection()
+            await oracle_conn.run_blocking(lambda: None)
+            slots.release()
+
+        await asyncio.wait_for(asyncio.gather(*(query() for _ in range(6))), timeout=5)
+
+        assert mock_pool.acquire.call_count == 6
+        oracle_conn.close_pool()
+
     @pytest.mark.unit
     def test_connection_string_parsing_edge_cases(self):
         """Test various edge cases in connection string parsing"""
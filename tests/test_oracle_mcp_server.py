@@ -20,6 +20,43 @@ class TestOracleMCPServer:
             assert server.inspector is not None
             assert server.executor is not None
 
+    @pytest.mark.unit
+    def test_init_with_connection_string(self):
+        """Test an explicit connection string takes precedence over the environment"""
+        with patch('oracle_mcp_server.server.DB_CONNECTION_STRING', 'env_connection'):
+            server = OracleMCPServer(connection_string='explicit_connection')
+
+            assert server.connection_manager.connection_string == 'explicit_connection'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_run_with_connection_string_and_no_env(self):
+        """Test run accepts an explicit connection string when the environment has none"""
+        with patch('oracle_mcp_server.server.DB_CONNECTION_STRING', None):
+            server = OracleMCPServer(connection_string='explicit_connection')
+        server.connection_manager.initialize_pool = AsyncMock()
+        server.setup_handlers = AsyncMock()
+        server.server.run = AsyncMock()
+
+        stdio = MagicMock()
+        stdio.return_value.__aenter__ = AsyncMock(return_value=("read", "write"))
+        stdio.return_value.__aexit__ = AsyncMock(return_value=False)
+        with patch('oracle_mcp_server.server.stdio_server', stdio):
+            await server.run()
+
+        server.connection_manager.initialize_pool.assert_called_once()
+        server.server.run.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_run_without_connection_string_exits(self):
+        """Test run exits when neither the argument nor the environment gives a connection string"""
+        with patch('oracle_mcp_server.server.DB_CONNECTION_STRING', None):
+            server = OracleMCPServer()
+
+        with pytest.raises(SystemExit):
+            await server.run()
+
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_setup_handlers_runs_without_error(self):
@@ -250,4 +287,49 @@ class TestOracleMCPServer:
             assert server.server is not None
             assert server.connection_manager is not None
             assert server.inspector is not None
-            assert server.executor is not None
\ No newline at end of file
+            assert server.executor is not None
+
+    @staticmethod
+    async def _capture_call_tool(server):
+        """Register handlers and return the call_tool handler"""
+        handlers = {}
+        server.server = MagicMock()
+        server.server.list_resources = MagicMock(return_value=lambda f: f)
+        server.server.read_resource = MagicMock(return_value=lambda f: f)
+        server.server.list_tools = MagicMock(return_value=lambda f: f)
+        server.server.call_tool = MagicMock(
+            return_value=lambda f: handlers.setdefault('call_tool', f)
+        )
+        await server.setup_handlers()
+        return handlers['call_tool']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_call_tool_dispatches_to_handler(self):
+        """Test that call_tool routes a tool name to its handler"""
+        with patch('oracle_mcp_server.server.DB_CONNECTION_STRING', 'test_connection'):
+            server = OracleMCPServer()
+            server.inspector = MagicMock()
+            server.inspector.get_tables = AsyncMock(return_value=[
+                {'owner': 'HR', 'table_name': 'EMPLOYEES'}
+            ])
+
+            call_tool = await self._capture_call_tool(server)
+            result = await call_tool('list_tables', {'owner': 'HR', 'limit': 5})
+
+            assert json.loads(result[0].text) == {
+                'tables': [{'owner': 'HR', 'table_name': 'EMPLOYEES'}]
+            }
+            server.inspector.get_tables.assert_called_once_with('HR', 5)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_call_tool_unknown_tool(self):
+        """Test that an unknown tool name returns an error message"""
+        with patch('oracle_mcp_server.server.DB_CONNECTION_STRING', 'test_connection'):
+            server = OracleMCPServer()
+
+            call_tool = await self._capture_call_tool(server)
+            result = await call_tool('drop_everything', {})
+
+            assert result[0].text == 'Error: Unknown tool: drop_everything'
@@ -6,7 +6,7 @@ import argparse
 from io import StringIO
 
 # Import main function for testing
-from oracle_mcp_server.server import main, async_main
+from oracle_mcp_server.server import main, async_main, _rows_to_csv
 
 
 class TestUtils:
@@ -45,6 +45,21 @@ class TestUtils:
                 
                 mock_run.assert_called_once()
 
+    @pytest.mark.unit
+    def test_main_function_uses_uvloop(self):
+        """Test main installs the uvloop policy when uvloop is importable"""
+        test_args = ['oracle-mcp-server']
+        fake_uvloop = MagicMock()
+
+        with patch.object(sys, 'argv', test_args):
+            with patch.dict(sys.modules, {'uvloop': fake_uvloop}):
+                with patch('oracle_mcp_server.server.asyncio.set_event_loop_policy') as mock_policy:
+                    with patch('oracle_mcp_server.server.asyncio.run') as mock_run:
+                        main()
+
+                        mock_policy.assert_called_once_with(fake_uvloop.EventLoopPolicy.return_value)
+                        mock_run.assert_called_once()
+
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_async_main_keyboard_interrupt(self):
@@ -234,4 +249,21 @@ class TestUtils:
             help_output = mock_stdout.getvalue()
             assert "Oracle Database MCP Server" in help_output
             assert "--debug" in help_output
-            assert "--version" in help_output
\ No newline at end of file
+            assert "--version" in help_output
+
+    @pytest.mark.unit
+    def test_rows_to_csv_quoting(self):
+        """Test CSV export quoting and None handling"""
+        columns = ['ID', 'NAME', 'NOTE']
+        rows = [
+            [1, 'Smith, John', None],
+            [2, 'Say "hi"', 'line one\nline two'],
+        ]
+
+        csv_content = _rows_to_csv(columns, rows)
+
+        assert csv_content == (
+            'ID,NAME,NOTE\n'
+            '1,"Smith, John",\n'
+            '2,"Say ""hi""","line one\nline two"'
+        )